@@ -2,13 +2,85 @@ import asyncio
 import logging
 import paramiko
 import html
-from telegram import Update
-from telegram.ext import Application, CommandHandler, ContextTypes, filters
+import posixpath
+import re
+import shlex
+import stat
+import time
+from collections import OrderedDict
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes, filters
 
 # Configuration
 BOT_TOKEN = "YOUR_BOT_TOKEN_HERE"
 ALLOWED_USER_ID = 1234567890  # Your User ID
 
+# Update delivery: "polling" (default) or "webhook"
+RUN_MODE = "polling"
+# Webhook settings (used when RUN_MODE = "webhook")
+WEBHOOK_LISTEN = "127.0.0.1"  # plain-HTTP listener; put a TLS reverse proxy in front of it
+WEBHOOK_PORT = 8443
+WEBHOOK_PATH = "sttbot"
+WEBHOOK_URL = "https://your.domain.example/sttbot"  # public URL Telegram posts updates to
+WEBHOOK_SECRET_PLACEHOLDER = "CHANGE_ME_random_secret_token"
+WEBHOOK_SECRET = WEBHOOK_SECRET_PLACEHOLDER  # checked against X-Telegram-Bot-Api-Secret-Token; must be changed
+# Bot API endpoint; point it at a local fake Bot API for testing
+BOT_API_BASE_URL = "https://api.telegram.org/bot"
+# Only commands and inline keyboard presses are handled, so don't subscribe to every update type
+ALLOWED_UPDATES = [Update.MESSAGE, Update.CALLBACK_QUERY]
+
+# SSH transport profiles, selectable with /connect ... [profile]
+# ciphers/kex list the preferred algorithms; paramiko's defaults follow as fallback
+SSH_PROFILES = {
+    "default": {
+        "compress": False,
+        "window_size": 2 * 1024 * 1024,
+        "max_packet_size": 32 * 1024,
+        "ciphers": None,
+        "kex": None,
+        "keepalive": 0
+    },
+    # Slow, high-latency links (LTE): compress output, cheap AEAD cipher,
+    # small packets and keepalives so carrier NAT doesn't drop idle sessions
+    "low-bandwidth": {
+        "compress": True,
+        "window_size": 1024 * 1024,
+        "max_packet_size": 16 * 1024,
+        "ciphers": ["aes128-gcm@openssh.com", "aes128-ctr"],
+        "kex": ["curve25519-sha256@libssh.org", "ecdh-sha2-nistp256"],
+        "keepalive": 15
+    },
+    # Fast links with bulk output: large window so the sender never stalls
+    # waiting for window adjustments, no compression overhead
+    "high-throughput": {
+        "compress": False,
+        "window_size": 16 * 1024 * 1024,
+        "max_packet_size": 32 * 1024,
+        "ciphers": ["aes128-gcm@openssh.com", "aes256-gcm@openssh.com", "aes128-ctr"],
+        "kex": ["curve25519-sha256@libssh.org"],
+        "keepalive": 60
+    }
+}
+DEFAULT_SSH_PROFILE = "default"
+
+# Background jobs (/execute --bg)
+MAX_JOBS_PER_SESSION = 32  # running jobs; sshd's MaxSessions (default 10) may cap this lower
+JOB_OUTPUT_LIMIT = 64 * 1024  # characters of output kept per job
+JOB_HISTORY = 20  # finished jobs kept in /jobs
+JOB_POLL_INTERVAL = 0.2  # seconds between reads of a background job's channel
+
+# Remote directory listing cache (/ls, cd validation, /cd completion)
+DIR_CACHE_TTL = 30  # seconds a listing stays valid
+DIR_CACHE_MAX_DIRS = 256  # listings kept per session
+DIR_KEYBOARD_SIZE = 12  # directory buttons per inline keyboard
+# Commands that don't change the filesystem; anything else invalidates the cache.
+# Nothing that runs another program (env, nice, less/more with "!", ...) belongs here.
+READ_ONLY_COMMANDS = {
+    "ls", "ll", "cat", "head", "tail", "grep", "egrep", "fgrep", "wc",
+    "du", "df", "pwd", "echo", "whoami", "id", "uname", "ps", "free",
+    "uptime", "date", "stat", "file", "which", "printenv", "journalctl", "ping"
+}
+
 # Enable logging
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -23,9 +95,41 @@ class SSHTunnelBot:
         self.active_commands = {}  # user_id -> (channel, task, message)
         self.input_queues = {}  # user_id -> asyncio.Queue
         self.current_dirs = {}  # user_id -> current directory
+        self.jobs = {}  # user_id -> {job_id: background job info}
+        self.next_job_ids = {}  # user_id -> next job id
+        self.sftp_clients = {}  # user_id -> SFTPClient, or None if SFTP is unavailable
+        self.dir_cache = {}  # user_id -> OrderedDict(path -> (fetched_at, entries))
+        self.completions = {}  # user_id -> (generation, [paths]) offered on the last keyboard
+        
+    @staticmethod
+    def _transport_factory(settings):
+        """Build a paramiko Transport factory for a transport profile"""
+        def prefer(preferred, available):
+            if not preferred:
+                return available
+            preferred = [name for name in preferred if name in available]
+            return tuple(preferred) + tuple(name for name in available if name not in preferred)
+        
+        def factory(sock, **kwargs):
+            transport = paramiko.Transport(
+                sock,
+                default_window_size=settings['window_size'],
+                default_max_packet_size=settings['max_packet_size'],
+                **kwargs
+            )
+            options = transport.get_security_options()
+            options.ciphers = prefer(settings['ciphers'], options.ciphers)
+            options.kex = prefer(settings['kex'], options.kex)
+            return transport
         
-    async def connect_ssh(self, user_id, host_port, username, password):
+        return factory
+    
+    async def connect_ssh(self, user_id, host_port, username, password, profile=DEFAULT_SSH_PROFILE):
         """Establish SSH connection"""
+        if profile not in SSH_PROFILES:
+            return f"❌ Unknown profile '{profile}'. Available: {', '.join(SSH_PROFILES)}"
+        settings = SSH_PROFILES[profile]
+        
         try:
             # Parse host:port
             if ":" in host_port:
@@ -47,12 +151,23 @@ class SSHTunnelBot:
                 password=password,
                 timeout=10,
                 banner_timeout=10,
-                auth_timeout=10
+                auth_timeout=10,
+                compress=settings['compress'],
+                transport_factory=self._transport_factory(settings)
             )
             
-            # Get initial directory
-            stdin, stdout, stderr = client.exec_command("pwd")
-            initial_dir = stdout.read().decode().strip()
+            transport = client.get_transport()
+            if settings['keepalive']:
+                transport.set_keepalive(settings['keepalive'])
+            
+            # Get initial directory, plus uid/groups for directory permission checks
+            stdin, stdout, stderr = client.exec_command("pwd; id -u; id -G")
+            output = stdout.read().decode().splitlines()
+            initial_dir = output[0].strip() if output else ""
+            try:
+                uid, gids = int(output[1]), {int(gid) for gid in output[2].split()}
+            except (IndexError, ValueError):
+                uid, gids = None, set()
             
             # Store connection
             self.ssh_clients[user_id] = client
@@ -60,6 +175,10 @@ class SSHTunnelBot:
                 'host': host,
                 'port': port,
                 'username': username,
+                'profile': profile,
+                'home': initial_dir,
+                'uid': uid,
+                'gids': gids,
                 'connected_at': asyncio.get_event_loop().time()
             }
             self.current_dirs[user_id] = initial_dir
@@ -67,7 +186,8 @@ class SSHTunnelBot:
             # Create input queue for this user
             self.input_queues[user_id] = asyncio.Queue()
             
-            return f"✅ Connected to {username}@{host}:{port}\n📁 Current directory: {initial_dir}"
+            return (f"✅ Connected to {username}@{host}:{port} ({profile})\n"
+                    f"📁 Current directory: {initial_dir}")
             
         except paramiko.AuthenticationException:
             return "❌ Authentication failed. Check username/password."
@@ -82,14 +202,18 @@ class SSHTunnelBot:
             return "❌ Not connected to any SSH server."
         
         try:
-            # Stop any active command
+            # Stop any active command and background jobs
             await self.stop_command(user_id)
+            await asyncio.gather(*(self.kill_job(user_id, job_id) for job_id in list(self.jobs.get(user_id, {}))))
             
             client = self.ssh_clients[user_id]
             session_info = self.ssh_sessions[user_id]
             host = session_info['host']
             username = session_info['username']
             
+            sftp = self.sftp_clients.pop(user_id, None)
+            if sftp:
+                sftp.close()
             client.close()
             
             # Clean up
@@ -101,12 +225,43 @@ class SSHTunnelBot:
                 del self.input_queues[user_id]
             if user_id in self.current_dirs:
                 del self.current_dirs[user_id]
+            if user_id in self.jobs:
+                del self.jobs[user_id]
+            if user_id in self.next_job_ids:
+                del self.next_job_ids[user_id]
+            if user_id in self.dir_cache:
+                del self.dir_cache[user_id]
+            if user_id in self.completions:
+                del self.completions[user_id]
             
             return f"✅ Disconnected from {username}@{host}"
             
         except Exception as e:
             return f"❌ Error disconnecting: {str(e)}"
     
+    @staticmethod
+    def _read_channel(channel):
+        """Read whatever stdout/stderr data a channel has buffered"""
+        output = ""
+        
+        while channel.recv_ready():
+            try:
+                data = channel.recv(1024).decode('utf-8', errors='ignore')
+                if data:
+                    output += data
+            except:
+                break
+        
+        while channel.recv_stderr_ready():
+            try:
+                data = channel.recv_stderr(1024).decode('utf-8', errors='ignore')
+                if data:
+                    output += f"[stderr] {data}"
+            except:
+                break
+        
+        return output
+    
     async def execute_command_realtime(self, user_id, command, message_callback):
         """Execute command with real-time output streaming"""
         if user_id not in self.ssh_clients:
@@ -123,23 +278,24 @@ class SSHTunnelBot:
                 # Extract path from cd command
                 cd_path = command[3:].strip()
                 
-                # Execute cd and get new directory
-                # We use && pwd to get the new directory after cd
-                cd_command = f"cd {cd_path} 2>/dev/null && pwd || echo 'Error: Directory not found'"
+                # Simple paths are checked against the directory cache, no exec round trip
+                target = self.resolve_remote_path(user_id, cd_path)
+                if target is not None:
+                    is_dir = await self.is_remote_dir(user_id, target)
+                    if is_dir:
+                        old_dir = self.current_dirs.get(user_id, "~")
+                        self.current_dirs[user_id] = target
+                        return command, f"📁 Directory changed:\n{old_dir} → {target}"
+                    if is_dir is False:
+                        return command, "❌ Failed to change directory: Directory not found or permission denied"
                 
-                stdin, stdout, stderr = client.exec_command(cd_command)
-                output = stdout.read().decode().strip()
-                error = stderr.read().decode().strip()
-                
-                if output and "Error:" not in output:
-                    # Update current directory
-                    new_dir = output
+                # Let the remote shell resolve it (~, quoting, ACLs, ...)
+                new_dir = await self.probe_remote_dir(user_id, cd_path)
+                if new_dir:
                     old_dir = self.current_dirs.get(user_id, "~")
                     self.current_dirs[user_id] = new_dir
                     return command, f"📁 Directory changed:\n{old_dir} → {new_dir}"
-                else:
-                    error_msg = error if error else "Directory not found or permission denied"
-                    return command, f"❌ Failed to change directory: {error_msg}"
+                return command, "❌ Failed to change directory: Directory not found or permission denied"
             
             # For regular commands, prepend with cd to current directory
             else:
@@ -154,7 +310,7 @@ class SSHTunnelBot:
                 channel.get_pty(term='xterm', width=80, height=24)
                 
                 # Execute command with cd to current directory
-                actual_command = f"cd '{current_dir}' && {command}"
+                actual_command = f"cd {shlex.quote(current_dir)} && {command}"
                 channel.exec_command(actual_command)
                 
                 # Store active command
@@ -190,36 +346,13 @@ class SSHTunnelBot:
                     # Check for input to send
                     await check_and_send_input()
                     
-                    # Check if channel has data
-                    if channel.recv_ready():
-                        while channel.recv_ready():
-                            try:
-                                data = channel.recv(1024).decode('utf-8', errors='ignore')
-                                if data:
-                                    output_buffer += data
-                            except:
-                                break
-                    
-                    # Check if channel has stderr data
-                    if channel.recv_stderr_ready():
-                        while channel.recv_stderr_ready():
-                            try:
-                                data = channel.recv_stderr(1024).decode('utf-8', errors='ignore')
-                                if data:
-                                    output_buffer += f"[stderr] {data}"
-                            except:
-                                break
+                    # Read stdout/stderr data
+                    output_buffer += self._read_channel(channel)
                     
                     # Check if command has finished
                     if channel.exit_status_ready():
                         # Get any remaining data
-                        while channel.recv_ready():
-                            try:
-                                data = channel.recv(1024).decode('utf-8', errors='ignore')
-                                if data:
-                                    output_buffer += data
-                            except:
-                                break
+                        output_buffer += self._read_channel(channel)
                         break
                     
                     # Update message at intervals if there's new output
@@ -235,6 +368,10 @@ class SSHTunnelBot:
                 if user_id in self.active_commands:
                     del self.active_commands[user_id]
                 
+                # Cached listings may be stale now
+                if not self.is_read_only(command):
+                    self.invalidate_dir_cache(user_id)
+                
                 # Get exit status
                 exit_status = channel.recv_exit_status()
                 
@@ -254,6 +391,310 @@ class SSHTunnelBot:
                 del self.active_commands[user_id]
             return command, f"❌ Execution failed: {str(e)}"
     
+    async def start_job(self, user_id, command):
+        """Start command as a background job on its own channel"""
+        if user_id not in self.ssh_clients:
+            return None, "❌ Not connected to SSH. Use /connect first."
+        
+        jobs = self.jobs.setdefault(user_id, {})
+        running = [job for job in jobs.values() if job['exit_status'] is None]
+        if len(running) >= MAX_JOBS_PER_SESSION:
+            return None, f"❌ Too many running jobs ({MAX_JOBS_PER_SESSION}). Use /kill to stop one."
+        
+        try:
+            current_dir = self.current_dirs.get(user_id, "~")
+            
+            transport = self.ssh_clients[user_id].get_transport()
+            channel = transport.open_session()
+            channel.get_pty(term='xterm', width=80, height=24)
+            channel.exec_command(f"cd {shlex.quote(current_dir)} && {command}")
+            
+            job_id = self.next_job_ids.get(user_id, 1)
+            self.next_job_ids[user_id] = job_id + 1
+            
+            job = {
+                'id': job_id,
+                'user_id': user_id,
+                'command': command,
+                'channel': channel,
+                'output': "",
+                'exit_status': None,
+                'killed': False,
+                'start_time': asyncio.get_event_loop().time(),
+                'end_time': None
+            }
+            job['task'] = asyncio.create_task(self._run_job(job))
+            if not self.is_read_only(command):
+                self.invalidate_dir_cache(user_id)
+            jobs[job_id] = job
+            
+            # Forget the oldest finished jobs
+            finished = [job_id for job_id, job in jobs.items() if job['exit_status'] is not None]
+            for old_id in finished[:-JOB_HISTORY]:
+                del jobs[old_id]
+            
+            return job_id, f"🔄 Job [{job_id}] started: {command}"
+            
+        except paramiko.SSHException as e:
+            return None, f"❌ SSH Error: {str(e)}"
+        except Exception as e:
+            return None, f"❌ Failed to start job: {str(e)}"
+    
+    @staticmethod
+    def _append_job_output(job, data):
+        """Append to a job's output, keeping only the last JOB_OUTPUT_LIMIT characters"""
+        job['output'] += data
+        # Trim in batches so appends stay cheap
+        if len(job['output']) > 2 * JOB_OUTPUT_LIMIT:
+            job['output'] = job['output'][-JOB_OUTPUT_LIMIT:]
+    
+    async def _run_job(self, job):
+        """Collect a background job's output until it exits"""
+        channel = job['channel']
+        
+        try:
+            while not channel.exit_status_ready():
+                data = self._read_channel(channel)
+                if data:
+                    self._append_job_output(job, data)
+                await asyncio.sleep(JOB_POLL_INTERVAL)
+            
+            # Get any remaining data
+            self._append_job_output(job, self._read_channel(channel))
+            job['exit_status'] = channel.recv_exit_status()
+        except Exception as e:
+            self._append_job_output(job, f"\n❌ Job failed: {str(e)}")
+            job['exit_status'] = -1
+        finally:
+            job['end_time'] = asyncio.get_event_loop().time()
+            channel.close()
+            if not self.is_read_only(job['command']):
+                self.invalidate_dir_cache(job['user_id'])
+    
+    def get_job(self, user_id, job_id):
+        """Return job info or None"""
+        return self.jobs.get(user_id, {}).get(job_id)
+    
+    def job_output(self, job):
+        """Buffered output of a job, with exit status once it finished"""
+        output = job['output'][-JOB_OUTPUT_LIMIT:]
+        if job['killed']:
+            output += "\n\nKilled"
+        elif job['exit_status'] not in (None, 0):
+            output += f"\n\nExit status: {job['exit_status']}"
+        return output
+    
+    async def follow_job(self, user_id, job_id, message_callback):
+        """Stream a job's output to message_callback until it exits"""
+        job = self.get_job(user_id, job_id)
+        if job is None:
+            return
+        
+        update_interval = 1.0
+        last_output = None
+        while job['exit_status'] is None:
+            output = self.job_output(job)
+            if output and output != last_output:
+                await message_callback(job['command'], output)
+                last_output = output
+            await asyncio.sleep(update_interval)
+        
+        await message_callback(job['command'], self.job_output(job) or "(no output)")
+    
+    async def kill_job(self, user_id, job_id):
+        """Stop a background job (Ctrl+C, then close its channel)"""
+        job = self.get_job(user_id, job_id)
+        if job is None:
+            return False, f"❌ No job [{job_id}]."
+        if job['exit_status'] is not None:
+            return False, f"❌ Job [{job_id}] already finished."
+        
+        try:
+            channel = job['channel']
+            job['killed'] = True
+            
+            # Send Ctrl+C (SIGINT) and give the command a moment to exit
+            channel.send('\x03')
+            await asyncio.sleep(0.5)
+            
+            if not channel.exit_status_ready():
+                channel.close()
+            await job['task']
+            
+            return True, f"⏹️ Job [{job_id}] '{job['command']}' killed"
+            
+        except Exception as e:
+            return False, f"❌ Error killing job: {str(e)}"
+    
+    @staticmethod
+    def is_read_only(command):
+        """Whether a command line only runs READ_ONLY_COMMANDS without redirection or substitution"""
+        if any(token in command for token in (">", "$(", "`", "\n")):
+            return False
+        for part in re.split(r"[;&|]+", command):
+            words = part.split()
+            if words and words[0] not in READ_ONLY_COMMANDS:
+                return False
+        return True
+    
+    def resolve_remote_path(self, user_id, path, literal=False):
+        """Absolute remote path for a simple cd argument, None if the shell has to resolve it.
+        
+        With literal=True the path is taken as-is (no shell), so any characters are allowed.
+        """
+        if not path or path == "-" or (not literal and re.search(r"[\s$`*?\[\]{}'\"\\;|&<>()!]", path)):
+            return None
+        
+        home = self.ssh_sessions.get(user_id, {}).get('home')
+        if path == "~" or path.startswith("~/"):
+            if not home:
+                return None
+            path = home + path[1:]
+        elif path.startswith("~"):
+            return None
+        
+        base = self.current_dirs.get(user_id, home or "/")
+        return posixpath.normpath(posixpath.join(base, path))
+    
+    async def _get_sftp(self, user_id):
+        """SFTP client for a session, opened on first use; None if the server has no SFTP"""
+        if user_id not in self.sftp_clients:
+            try:
+                client = self.ssh_clients[user_id]
+                self.sftp_clients[user_id] = await asyncio.to_thread(client.open_sftp)
+            except Exception as e:
+                logger.warning(f"SFTP not available, falling back to exec: {e}")
+                self.sftp_clients[user_id] = None
+        return self.sftp_clients[user_id]
+    
+    async def list_dir(self, user_id, path, refresh=False):
+        """Cached listing (SFTPAttributes) of a remote directory; None if it can't be listed"""
+        cache = self.dir_cache.setdefault(user_id, OrderedDict())
+        cached = cache.get(path)
+        if cached and not refresh and time.monotonic() - cached[0] < DIR_CACHE_TTL:
+            cache.move_to_end(path)
+            return cached[1]
+        
+        sftp = await self._get_sftp(user_id)
+        if sftp is None:
+            return None
+        
+        try:
+            entries = await asyncio.to_thread(sftp.listdir_attr, path)
+        except (IOError, paramiko.SSHException):
+            cache.pop(path, None)
+            return None
+        
+        entries.sort(key=lambda entry: entry.filename)
+        cache[path] = (time.monotonic(), entries)
+        cache.move_to_end(path)
+        while len(cache) > DIR_CACHE_MAX_DIRS:
+            cache.popitem(last=False)
+        return entries
+    
+    def dir_cache_age(self, user_id, path):
+        """Seconds since a cached listing was fetched"""
+        cached = self.dir_cache.get(user_id, {}).get(path)
+        return time.monotonic() - cached[0] if cached else 0
+    
+    def invalidate_dir_cache(self, user_id):
+        """Forget all cached listings of a session"""
+        if user_id in self.dir_cache:
+            self.dir_cache[user_id].clear()
+    
+    def can_search(self, user_id, attrs):
+        """Whether the login may enter a directory with these attributes (None if unknown)"""
+        session = self.ssh_sessions.get(user_id, {})
+        uid = session.get('uid')
+        if uid is None:
+            return None
+        if uid == 0:
+            return True
+        if attrs.st_uid == uid:
+            return bool(attrs.st_mode & stat.S_IXUSR)
+        if attrs.st_gid in session.get('gids', ()):
+            return bool(attrs.st_mode & stat.S_IXGRP)
+        return bool(attrs.st_mode & stat.S_IXOTH)
+    
+    async def is_remote_dir(self, user_id, path):
+        """True if path is a directory the login can enter, False if it doesn't exist
+        or isn't a directory, None if the listing can't tell (ask probe_remote_dir)"""
+        if path == "/":
+            return True
+        
+        parent, name = posixpath.split(path)
+        entries = await self.list_dir(user_id, parent)
+        entry = next((entry for entry in entries or [] if entry.filename == name), None)
+        if entry is None and entries is not None:
+            # The cached listing may predate the directory (e.g. made by a job): re-list once
+            entries = await self.list_dir(user_id, parent, refresh=True)
+            entry = next((entry for entry in entries or [] if entry.filename == name), None)
+        if entries is None:
+            return None
+        if entry is None:
+            return False
+        if stat.S_ISLNK(entry.st_mode):
+            # Follow the symlink
+            try:
+                sftp = await self._get_sftp(user_id)
+                entry = await asyncio.to_thread(sftp.stat, path)
+            except (IOError, paramiko.SSHException):
+                return False
+        if not stat.S_ISDIR(entry.st_mode):
+            return False
+        # The mode bits don't cover ACLs or capabilities, so only trust a yes
+        return True if self.can_search(user_id, entry) else None
+    
+    async def probe_remote_dir(self, user_id, cd_arg):
+        """Run cd_arg through the remote shell from the current directory; the new directory or None"""
+        current_dir = self.current_dirs.get(user_id)
+        prefix = f"cd {shlex.quote(current_dir)} && " if current_dir else ""
+        command = f"{prefix}cd {cd_arg} 2>/dev/null && pwd"
+        
+        def run():
+            stdin, stdout, stderr = self.ssh_clients[user_id].exec_command(command)
+            return stdout.read().decode().strip()
+        
+        try:
+            return await asyncio.to_thread(run) or None
+        except paramiko.SSHException:
+            return None
+    
+    async def can_enter(self, user_id, path):
+        """Whether cd into an absolute path works: cached listing first, remote shell if unsure"""
+        is_dir = await self.is_remote_dir(user_id, path)
+        if is_dir is None:
+            is_dir = await self.probe_remote_dir(user_id, shlex.quote(path)) is not None
+        return is_dir
+    
+    async def subdirectories(self, user_id, path, prefix=""):
+        """Names of directories (including symlinks) in path starting with prefix"""
+        entries = await self.list_dir(user_id, path)
+        if entries is None:
+            return None
+        return [
+            entry.filename for entry in entries
+            if entry.filename.startswith(prefix)
+            and (stat.S_ISDIR(entry.st_mode) or stat.S_ISLNK(entry.st_mode))
+        ]
+    
+    def offer_completions(self, user_id, paths):
+        """Remember paths offered on an inline keyboard; returns their callback data"""
+        generation = self.completions.get(user_id, (0, []))[0] + 1
+        self.completions[user_id] = (generation, paths)
+        return [f"cd:{generation}:{index}" for index in range(len(paths))]
+    
+    def completion_path(self, user_id, data):
+        """Path behind a keyboard button's callback data, None if the keyboard is outdated"""
+        try:
+            _, generation, index = data.split(":")
+            current, paths = self.completions[user_id]
+            if int(generation) != current:
+                return None
+            return paths[int(index)]
+        except (KeyError, ValueError, IndexError):
+            return None
+    
     async def stop_command(self, user_id):
         """Stop currently running command (Ctrl+C)"""
         if user_id not in self.active_commands:
@@ -293,6 +734,23 @@ class SSHTunnelBot:
         except Exception as e:
             return False, f"❌ Error queuing input: {str(e)}"
     
+    def transport_info(self, user_id):
+        """Effective transport settings of a connection"""
+        session = self.ssh_sessions[user_id]
+        settings = SSH_PROFILES[session['profile']]
+        transport = self.ssh_clients[user_id].get_transport()
+        
+        return {
+            'profile': session['profile'],
+            'cipher': transport.local_cipher,
+            # GCM ciphers authenticate themselves; the negotiated MAC is unused
+            'mac': None if 'gcm' in transport.local_cipher else transport.local_mac,
+            'compression': transport.local_compression,
+            'window_size': transport.default_window_size,
+            'max_packet_size': transport.default_max_packet_size,
+            'keepalive': settings['keepalive']
+        }
+    
     async def get_current_dir(self, user_id):
         """Get current directory for user"""
         if user_id in self.current_dirs:
@@ -310,6 +768,9 @@ def restricted(func):
     async def wrapped(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
         user_id = update.effective_user.id
         if user_id != ALLOWED_USER_ID:
+            if update.callback_query:
+                await update.callback_query.answer("⛔ Access denied.")
+                return
             await update.message.reply_text(
                 "⛔ Access denied.\n"
                 "TheTunnel Bot - Secure SSH Bridge"
@@ -324,9 +785,15 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     welcome_text = """🔐 TheTunnel Bot - SSH Bridge
 
 Available commands:
-/connect <IP:PORT> <Username> <Password> - Connect to SSH server
+/connect <IP:PORT> <Username> <Password> [profile] - Connect to SSH server
 /execute <command> - Execute command on connected server
+/execute --bg <command> - Run command as a background job
+/jobs - List background jobs
+/fg <id> - Show a job's output (live until it exits)
+/kill <id> - Stop a background job
 /pwd - Show current directory
+/ls [-r] [path] - List directory (cached, tap folders to navigate)
+/cd [path or prefix] - Change directory with completion
 /stop - Stop current command (Ctrl+C)
 /input <data> - Send input to running command
 /disconnect - Disconnect from SSH server
@@ -334,8 +801,10 @@ Available commands:
 
 Examples:
 /connect 192.168.1.100:22 root mypassword
+/connect 10.0.0.5:22 admin secret low-bandwidth
 /execute cd /var/www
 /execute ls -la
+/execute --bg tail -f /var/log/syslog
 /pwd
 """
     await update.message.reply_text(welcome_text)
@@ -345,14 +814,16 @@ async def connect_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /connect command"""
     if not context.args or len(context.args) < 3:
         await update.message.reply_text(
-            "❌ Usage: /connect <IP:PORT> <Username> <Password>\n"
-            "Example: /connect 192.168.1.100:22 root mypassword"
+            "❌ Usage: /connect <IP:PORT> <Username> <Password> [profile]\n"
+            "Example: /connect 192.168.1.100:22 root mypassword\n"
+            f"Profiles: {', '.join(SSH_PROFILES)}"
         )
         return
     
     host_port = context.args[0]
     username = context.args[1]
     password = context.args[2]
+    profile = context.args[3] if len(context.args) > 3 else DEFAULT_SSH_PROFILE
     
     user_id = update.effective_user.id
     
@@ -360,7 +831,7 @@ async def connect_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     connecting_msg = await update.message.reply_text(f"🔗 Connecting to {username}@{host_port}...")
     
     # Connect
-    result = await ssh_bot.connect_ssh(user_id, host_port, username, password)
+    result = await ssh_bot.connect_ssh(user_id, host_port, username, password, profile)
     
     # Update message
     await connecting_msg.edit_text(result)
@@ -370,14 +841,28 @@ async def execute_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /execute command with real-time updates"""
     if not context.args:
         await update.message.reply_text(
-            "❌ Usage: /execute <command>\n"
-            "Example: /execute ls -la"
+            "❌ Usage: /execute [--bg] <command>\n"
+            "Example: /execute ls -la\n"
+            "Example: /execute --bg make -j4"
         )
         return
     
-    command = " ".join(context.args)
     user_id = update.effective_user.id
     
+    # Background job: runs on its own channel, doesn't block other commands
+    if context.args[0] == "--bg":
+        if len(context.args) < 2:
+            await update.message.reply_text("❌ Usage: /execute --bg <command>")
+            return
+        
+        job_id, message = await ssh_bot.start_job(user_id, " ".join(context.args[1:]))
+        if job_id is not None:
+            message += f"\nUse /fg {job_id} to watch, /kill {job_id} to stop"
+        await update.message.reply_text(message)
+        return
+    
+    command = " ".join(context.args)
+    
     # Check if already executing a command
     if user_id in ssh_bot.active_commands:
         await update.message.reply_text(
@@ -456,6 +941,96 @@ async def execute_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         else:
             await executing_msg.edit_text(response, parse_mode='HTML')
 
+@restricted
+async def jobs_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /jobs command - list background jobs"""
+    user_id = update.effective_user.id
+    jobs = ssh_bot.jobs.get(user_id, {})
+    
+    if not jobs:
+        await update.message.reply_text("📭 No background jobs. Start one with /execute --bg <command>")
+        return
+    
+    now = asyncio.get_event_loop().time()
+    lines = ["📋 Background jobs:"]
+    for job in jobs.values():
+        if job['exit_status'] is None:
+            state = f"🔄 running {int(now - job['start_time'])}s"
+        elif job['killed']:
+            state = "⏹️ killed"
+        else:
+            state = f"✅ exit {job['exit_status']}" if job['exit_status'] == 0 else f"❌ exit {job['exit_status']}"
+        lines.append(f"[{job['id']}] {state} - {job['command']}")
+    
+    await update.message.reply_text("\n".join(lines))
+
+def parse_job_id(context):
+    """Parse the job id argument of /fg and /kill"""
+    if not context.args:
+        return None
+    try:
+        return int(context.args[0].strip("[]%"))
+    except ValueError:
+        return None
+
+def escaped_tail(text, limit):
+    """HTML-escape text and keep its last limit characters without splitting an entity"""
+    escaped = html.escape(text)
+    if len(escaped) <= limit:
+        return escaped
+    
+    start = len(escaped) - limit
+    amp = escaped.rfind("&", 0, start)
+    if amp != -1 and escaped.find(";", amp) >= start:
+        start = escaped.find(";", amp) + 1
+    return escaped[start:]
+
+@restricted
+async def fg_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /fg command - show a background job's output"""
+    job_id = parse_job_id(context)
+    if job_id is None:
+        await update.message.reply_text("❌ Usage: /fg <job id>\nExample: /fg 1")
+        return
+    
+    user_id = update.effective_user.id
+    job = ssh_bot.get_job(user_id, job_id)
+    if job is None:
+        await update.message.reply_text(f"❌ No job [{job_id}]. Use /jobs to list jobs.")
+        return
+    
+    class MessageUpdater:
+        def __init__(self, message):
+            self.message = message
+        
+        async def update(self, cmd, output):
+            header = f'[{job_id}] output "{html.escape(cmd[:100])}":\n'
+            output_clean = escaped_tail(output, 4096 - len(header) - len("<pre></pre>"))
+            response = f'{header}<pre>{output_clean}</pre>'
+            try:
+                await self.message.edit_text(response, parse_mode='HTML')
+            except Exception as e:
+                logger.error(f"Error updating message: {e}")
+    
+    message = await update.message.reply_text(f"📺 Job [{job_id}] '{job['command'][:50]}'...")
+    updater = MessageUpdater(message)
+    
+    # Follow in the background so other commands keep being handled
+    context.application.create_task(ssh_bot.follow_job(user_id, job_id, updater.update))
+
+@restricted
+async def kill_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /kill command - stop a background job"""
+    job_id = parse_job_id(context)
+    if job_id is None:
+        await update.message.reply_text("❌ Usage: /kill <job id>\nExample: /kill 1")
+        return
+    
+    user_id = update.effective_user.id
+    success, message = await ssh_bot.kill_job(user_id, job_id)
+    
+    await update.message.reply_text(message)
+
 @restricted
 async def pwd_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show current directory"""
@@ -533,6 +1108,17 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         # Current directory
         current_dir = ssh_bot.current_dirs.get(user_id, "Unknown")
         status_lines.append(f"Directory: {current_dir}")
+        
+        # Effective transport settings
+        info = ssh_bot.transport_info(user_id)
+        status_lines.append(f"Profile: {info['profile']}")
+        status_lines.append(f"Cipher: {info['cipher']} ({info['mac'] or 'AEAD'})")
+        status_lines.append(f"Compression: {info['compression']}")
+        status_lines.append(f"Window: {info['window_size'] // 1024} KiB, packet: {info['max_packet_size'] // 1024} KiB")
+        if info['keepalive']:
+            status_lines.append(f"Keepalive: {info['keepalive']}s")
+        else:
+            status_lines.append("Keepalive: off")
     else:
         status_lines.append("❌ Not connected to any SSH server")
     
@@ -550,8 +1136,55 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         status_lines.append("")
         status_lines.append("⏹️ No active commands")
     
+    # Background jobs
+    jobs = ssh_bot.jobs.get(user_id, {})
+    if jobs:
+        running = sum(1 for job in jobs.values() if job['exit_status'] is None)
+        status_lines.append(f"📋 Background jobs: {running} running, {len(jobs) - running} finished (/jobs)")
+    
     await update.message.reply_text("\n".join(status_lines))
 
+def directory_keyboard(user_id, paths, labels):
+    """Inline keyboard with one button per directory, three per row"""
+    buttons = [
+        InlineKeyboardButton(label[:30], callback_data=data)
+        for label, data in zip(labels, ssh_bot.offer_completions(user_id, paths))
+    ]
+    return InlineKeyboardMarkup([buttons[i:i + 3] for i in range(0, len(buttons), 3)])
+
+async def render_listing(user_id, path, refresh=False):
+    """Listing message for a directory and a keyboard to navigate into subdirectories"""
+    entries = await ssh_bot.list_dir(user_id, path, refresh)
+    if entries is None:
+        return None, None
+    
+    age = int(ssh_bot.dir_cache_age(user_id, path))
+    header = f"📂 {html.escape(path)}" + (f" (cached {age}s ago, /ls -r to refresh)" if age else "")
+    
+    # Keep within Telegram's 4096 characters
+    lines = []
+    budget = 4000 - len(header)
+    for index, entry in enumerate(entries):
+        line = html.escape(str(entry))
+        if len(line) + 1 > budget:
+            lines.append(f"... and {len(entries) - index} more")
+            break
+        lines.append(line)
+        budget -= len(line) + 1
+    body = "\n".join(lines) or "(empty)"
+    text = f"{header}\n<pre>{body}</pre>"
+    
+    subdirs = await ssh_bot.subdirectories(user_id, path)
+    paths, labels = [], []
+    if path != "/":
+        paths.append(posixpath.dirname(path))
+        labels.append("⬆️ ..")
+    for name in subdirs[:DIR_KEYBOARD_SIZE]:
+        paths.append(posixpath.join(path, name))
+        labels.append(f"📁 {name}")
+    
+    return text, directory_keyboard(user_id, paths, labels)
+
 @restricted
 async def ls_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /ls command - list directory contents"""
@@ -562,11 +1195,29 @@ async def ls_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("❌ Not connected to SSH. Use /connect first.")
         return
     
+    args = list(context.args)
+    refresh = "-r" in args
+    if refresh:
+        args.remove("-r")
+    
     # Get current directory
     current_dir = ssh_bot.current_dirs.get(user_id, "~")
+    path = ssh_bot.resolve_remote_path(user_id, " ".join(args), literal=True) if args else current_dir
+    if path is None:
+        await update.message.reply_text("❌ Usage: /ls [-r] [path]")
+        return
+    
+    # Cached SFTP listing
+    text, keyboard = await render_listing(user_id, path, refresh)
+    if text is not None:
+        await update.message.reply_text(text, parse_mode='HTML', reply_markup=keyboard)
+        return
+    
+    # No SFTP (or listing failed): fall back to ls over exec
+    command = f"ls -la {shlex.quote(path)}" if args else "ls -la"
     
     # Create message
-    executing_msg = await update.message.reply_text(f"📂 Listing directory: {current_dir}")
+    executing_msg = await update.message.reply_text(f"📂 Listing directory: {path}")
     
     # Execute ls command
     class MessageUpdater:
@@ -575,14 +1226,14 @@ async def ls_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
         async def update(self, cmd, output):
             output_clean = html.escape(output)
-            response = f'output "{cmd}":\n<pre>{output_clean}</pre>'
+            response = f'output "{html.escape(cmd)}":\n<pre>{output_clean}</pre>'
             await self.message.edit_text(response, parse_mode='HTML')
     
     updater = MessageUpdater(executing_msg)
     
     cmd_executed, output = await ssh_bot.execute_command_realtime(
         user_id, 
-        "ls -la", 
+        command, 
         updater.update
     )
     
@@ -591,51 +1242,159 @@ async def ls_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await executing_msg.edit_text(output)
     else:
         output_clean = html.escape(output)
-        response = f'output "{cmd_executed}":\n<pre>{output_clean}</pre>'
+        response = f'output "{html.escape(cmd_executed)}":\n<pre>{output_clean}</pre>'
         await executing_msg.edit_text(response, parse_mode='HTML')
 
-def main():
-    """Start the bot"""
-    # Install paramiko if not installed
-    try:
-        import paramiko
-    except ImportError:
-        print("Installing paramiko...")
-        import subprocess
-        subprocess.run(["pip", "install", "paramiko"])
-        import paramiko
+@restricted
+async def cd_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /cd command - change directory with inline keyboard completion"""
+    user_id = update.effective_user.id
     
-    # Create application
-    application = Application.builder().token(BOT_TOKEN).build()
+    if user_id not in ssh_bot.ssh_clients:
+        await update.message.reply_text("❌ Not connected to SSH. Use /connect first.")
+        return
+    
+    current_dir = ssh_bot.current_dirs.get(user_id, "~")
+    target = ssh_bot.resolve_remote_path(user_id, " ".join(context.args), literal=True) if context.args else current_dir
+    if target is None:
+        await update.message.reply_text("❌ Usage: /cd [path or prefix]")
+        return
+    
+    # Exact directory: change right away
+    is_dir = await ssh_bot.can_enter(user_id, target) if context.args else False
+    if is_dir:
+        ssh_bot.current_dirs[user_id] = target
+        changed = f"📁 Directory changed:\n{html.escape(current_dir)} → {html.escape(target)}"
+        
+        # The new directory may not be listable (e.g. execute but no read permission)
+        text, keyboard = await render_listing(user_id, target)
+        if text is not None:
+            changed += f"\n\n{text}"
+        await update.message.reply_text(changed, parse_mode='HTML', reply_markup=keyboard)
+        return
+    
+    # Otherwise complete the last path component
+    if context.args:
+        parent, prefix = posixpath.split(target)
+    else:
+        parent, prefix = target, ""
+    matches = await ssh_bot.subdirectories(user_id, parent, prefix)
+    
+    if matches is None:
+        await update.message.reply_text(f"❌ Can't list {parent}. Use /execute cd <path> instead.")
+    elif not matches:
+        await update.message.reply_text(f"❌ No directory matching '{prefix}' in {parent}")
+    elif prefix in matches:
+        # It exists but can't be entered (no search permission)
+        await update.message.reply_text(f"❌ Can't change to {target}")
+    elif len(matches) == 1 and prefix and await ssh_bot.can_enter(user_id, posixpath.join(parent, matches[0])):
+        new_dir = posixpath.join(parent, matches[0])
+        ssh_bot.current_dirs[user_id] = new_dir
+        await update.message.reply_text(f"📁 Directory changed:\n{current_dir} → {new_dir}")
+    else:
+        paths = [posixpath.join(parent, name) for name in matches[:DIR_KEYBOARD_SIZE]]
+        labels = [f"📁 {name}" for name in matches[:DIR_KEYBOARD_SIZE]]
+        more = f" (first {DIR_KEYBOARD_SIZE} of {len(matches)})" if len(matches) > DIR_KEYBOARD_SIZE else ""
+        await update.message.reply_text(
+            f"📂 {parent}: choose a directory{more}",
+            reply_markup=directory_keyboard(user_id, paths, labels)
+        )
+
+@restricted
+async def cd_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle directory keyboard presses from /ls and /cd"""
+    query = update.callback_query
+    user_id = update.effective_user.id
+    
+    path = ssh_bot.completion_path(user_id, query.data) if user_id in ssh_bot.ssh_clients else None
+    if path is None:
+        await query.answer("⌛ This keyboard is outdated, use /ls again.")
+        return
+    
+    if not await ssh_bot.can_enter(user_id, path):
+        await query.answer(f"❌ Can't change to {path}.")
+        return
+    
+    ssh_bot.current_dirs[user_id] = path
+    await query.answer(f"📁 {path}")
+    
+    text, keyboard = await render_listing(user_id, path)
+    if text is not None:
+        await query.edit_message_text(text, parse_mode='HTML', reply_markup=keyboard)
+
+def build_application(token=BOT_TOKEN, base_url=BOT_API_BASE_URL):
+    """Create the Telegram application with all command handlers"""
+    application = Application.builder().token(token).base_url(base_url).build()
     
     # Add command handlers
     application.add_handler(CommandHandler("start", start_command))
     application.add_handler(CommandHandler("connect", connect_command))
     application.add_handler(CommandHandler("execute", execute_command))
+    application.add_handler(CommandHandler("jobs", jobs_command))
+    application.add_handler(CommandHandler("fg", fg_command))
+    application.add_handler(CommandHandler("kill", kill_command))
     application.add_handler(CommandHandler("pwd", pwd_command))
     application.add_handler(CommandHandler("ls", ls_command))
+    application.add_handler(CommandHandler("cd", cd_command))
+    application.add_handler(CallbackQueryHandler(cd_callback, pattern=r"^cd:"))
     application.add_handler(CommandHandler("stop", stop_command))
     application.add_handler(CommandHandler("input", input_command))
     application.add_handler(CommandHandler("disconnect", disconnect_command))
     application.add_handler(CommandHandler("status", status_command))
     
+    return application
+
+def main():
+    """Start the bot"""
+    # Install paramiko if not installed
+    try:
+        import paramiko
+    except ImportError:
+        print("Installing paramiko...")
+        import subprocess
+        subprocess.run(["pip", "install", "paramiko"])
+        import paramiko
+    
+    # Create application
+    application = build_application()
+    
     # Start bot
     print("🔐 TheTunnel Bot - SSH Bridge")
     print(f"👤 Allowed User ID: {ALLOWED_USER_ID}")
     print("📝 Commands:")
     print("  /start - Show help")
-    print("  /connect <ip:port> <user> <pass> - Connect to SSH")
+    print("  /connect <ip:port> <user> <pass> [profile] - Connect to SSH")
     print("  /execute <command> - Run command")
+    print("  /execute --bg <command> - Run command as background job")
+    print("  /jobs, /fg <id>, /kill <id> - Manage background jobs")
     print("  /pwd - Show current directory")
-    print("  /ls - List directory contents")
+    print("  /ls [-r] [path] - List directory contents")
+    print("  /cd [path] - Change directory with completion")
     print("  /stop - Stop current command (Ctrl+C)")
     print("  /input <data> - Send input to command")
     print("  /disconnect - Disconnect")
     print("  /status - Show status")
-    print("⚡ Features: Persistent directory, real-time output, input sending")
+    print("⚡ Features: Persistent directory, real-time output, input sending, background jobs")
     print("⚠️  Warning: This bot provides SSH access via Telegram. Use with caution!")
     
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    if RUN_MODE == "webhook":
+        # The secret is all that stops forged updates from reaching the handlers
+        if not WEBHOOK_SECRET or WEBHOOK_SECRET == WEBHOOK_SECRET_PLACEHOLDER:
+            raise SystemExit(
+                "❌ Set WEBHOOK_SECRET to your own random value before using webhook mode, e.g.\n"
+                '   python -c "import secrets; print(secrets.token_urlsafe(32))"'
+            )
+        print(f"🌐 Webhook mode: listening on {WEBHOOK_LISTEN}:{WEBHOOK_PORT}/{WEBHOOK_PATH}")
+        application.run_webhook(
+            listen=WEBHOOK_LISTEN,
+            port=WEBHOOK_PORT,
+            url_path=WEBHOOK_PATH,
+            webhook_url=WEBHOOK_URL,
+            secret_token=WEBHOOK_SECRET,
+            allowed_updates=ALLOWED_UPDATES
+        )
+    else:
+        application.run_polling(allowed_updates=ALLOWED_UPDATES)
 
 if __name__ == '__main__':
     main()
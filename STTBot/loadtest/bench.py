@@ -0,0 +1,348 @@
+"""End-to-end load benchmarks for STTBot against local fakes.
+
+Runs the real bot handlers against FakeBotAPI (recording sendMessage /
+editMessageText, optional 429 injection) and FakeSSHServer (scripted
+output at a configurable rate). No bot token or remote host is needed.
+
+Usage (from the STTBot directory):
+    python loadtest/bench.py
+    python loadtest/bench.py --bench e2e --lines 2000 --rate 500 --rate-limit 1
+    python loadtest/bench.py --bench memory --sessions 50
+    python loadtest/bench.py --bench jobs --jobs 30
+    python loadtest/bench.py --bench dircache
+    python loadtest/bench.py --bench profiles --ssh 127.0.0.1:22 --ssh-user me --ssh-password pw
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telegram import Update
+
+import bot as sttbot
+from fake_botapi import FakeBotAPI
+from fake_sshd import FakeSSHServer
+
+BENCH_TOKEN = "123456:BENCH"
+STAMP_RE = re.compile(r"^\d{6} (\d+\.\d{6}) ", re.MULTILINE)
+
+def command_update(update_id, text, user_id=None):
+    """Build a Telegram Update carrying a bot command"""
+    user_id = user_id or sttbot.ALLOWED_USER_ID
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "Bench"},
+            "text": text,
+            "entities": [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+        }
+    }
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def format_ms(values):
+    if not values:
+        return "n/a"
+    return (f"p50 {statistics.median(values) * 1000:.1f} ms, "
+            f"p95 {percentile(values, 95) * 1000:.1f} ms, "
+            f"max {max(values) * 1000:.1f} ms")
+
+class LatencyRecorder:
+    """Measures output-to-visible-edit latency from stamps in edited text"""
+
+    def __init__(self):
+        self.latencies = []
+
+    def __call__(self, now, method, params):
+        stamps = STAMP_RE.findall(params.get("text", ""))
+        if stamps:
+            self.latencies.append(now - max(float(stamp) for stamp in stamps))
+
+async def bench_e2e(args, api, sshd):
+    """/connect + /execute through the real handlers"""
+    application = sttbot.build_application(BENCH_TOKEN, api.base_url)
+    failures = []
+
+    async def count_failure(update, context):
+        failures.append(type(context.error).__name__)
+
+    application.add_error_handler(count_failure)
+    await application.initialize()
+
+    # Only /execute runs under the flood limits; /connect and /disconnect are setup
+    limits = api.rate_limit, api.fail_every
+    api.rate_limit = api.fail_every = None
+    await application.process_update(Update.de_json(
+        command_update(1, f"/connect 127.0.0.1:{sshd.port} bench bench"), application.bot))
+
+    recorder = LatencyRecorder()
+    api.reset()
+    api.rate_limit, api.fail_every = limits
+    api.on_call = recorder
+    started = time.monotonic()
+    await application.process_update(Update.de_json(
+        command_update(2, f"/execute emit {args.lines} {args.rate} {args.width}"), application.bot))
+    elapsed = time.monotonic() - started
+
+    edits = len(api.calls_of("editMessageText"))
+    output_bytes = args.lines * (args.width + 2)
+    print("== e2e: /execute through handlers ==")
+    print(f"  duration:     {elapsed:.2f} s for {args.lines} lines ({output_bytes / 1024:.0f} KiB)")
+    print(f"  throughput:   {output_bytes / elapsed / 1024:.0f} KiB/s")
+    print(f"  edits:        {edits} ({edits / elapsed:.2f}/s), 429s injected: {api.throttled}")
+    print(f"  edit latency: {format_ms(recorder.latencies)}")
+    print(f"  failed:       {len(failures)} handler runs" + (f" ({', '.join(sorted(set(failures)))})" if failures else ""))
+
+    api.on_call = None
+    api.rate_limit = api.fail_every = None
+    await application.process_update(Update.de_json(command_update(3, "/disconnect"), application.bot))
+    api.rate_limit, api.fail_every = limits
+    await application.shutdown()
+
+async def bench_throughput(args, api, sshd):
+    """Raw execute_command_realtime throughput with a no-op callback"""
+    ssh_bot = sttbot.SSHTunnelBot()
+    user_id = 1
+    await ssh_bot.connect_ssh(user_id, f"127.0.0.1:{sshd.port}", "bench", "bench")
+
+    callbacks = 0
+
+    async def callback(cmd, output):
+        nonlocal callbacks
+        callbacks += 1
+
+    lines = args.lines * 10
+    started = time.monotonic()
+    _, output = await ssh_bot.execute_command_realtime(
+        user_id, f"emit {lines} 1000000 {args.width}", callback)
+    elapsed = time.monotonic() - started
+
+    print("== throughput: execute_command_realtime ==")
+    print(f"  received:     {len(output) / 1024:.0f} KiB in {elapsed:.2f} s")
+    print(f"  throughput:   {len(output) / elapsed / 1024:.0f} KiB/s")
+    print(f"  callbacks:    {callbacks} ({callbacks / elapsed:.2f}/s)")
+
+    await ssh_bot.disconnect_ssh(user_id)
+
+async def bench_jobs(args, sshd):
+    """Many concurrent background jobs on one session"""
+    ssh_bot = sttbot.SSHTunnelBot()
+    user_id = 1
+    await ssh_bot.connect_ssh(user_id, f"127.0.0.1:{sshd.port}", "bench", "bench")
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    started = time.monotonic()
+    for _ in range(args.jobs):
+        job_id, message = await ssh_bot.start_job(user_id, f"emit {args.lines} {args.rate} {args.width}")
+        if job_id is None:
+            print(f"  {message}")
+            break
+    jobs = list(ssh_bot.jobs[user_id].values())
+    await asyncio.gather(*(job['task'] for job in jobs))
+    elapsed = time.monotonic() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    single = args.lines / args.rate
+    output = sum(len(job['output']) for job in jobs)
+    print(f"== jobs: {len(jobs)} concurrent background jobs ==")
+    print(f"  wall time:    {elapsed:.2f} s (one job alone: ~{single:.2f} s)")
+    print(f"  output kept:  {output / 1024:.0f} KiB, exit statuses: {sorted({job['exit_status'] for job in jobs})}")
+    print(f"  peak memory:  {(peak - baseline) / len(jobs) / 1024:.1f} KiB per job")
+
+    await ssh_bot.disconnect_ssh(user_id)
+
+async def bench_dircache(args):
+    """cd validation and listing: cached SFTP vs an exec round trip each time"""
+    with tempfile.TemporaryDirectory() as root:
+        home = os.path.join(root, "home", "bench")
+        for index in range(200):
+            os.makedirs(os.path.join(home, f"dir{index:03d}"))
+        sshd = FakeSSHServer(sftp_root=root).start()
+
+        async def callback(cmd, output):
+            pass
+
+        async def timed(ssh_bot, command, runs=20):
+            started = time.monotonic()
+            for index in range(runs):
+                await ssh_bot.execute_command_realtime(1, command.format(index=index), callback)
+            return (time.monotonic() - started) / runs
+
+        print("== dircache: cd validation ==")
+        for label, use_sftp in (("exec", False), ("cached SFTP", True)):
+            ssh_bot = sttbot.SSHTunnelBot()
+            await ssh_bot.connect_ssh(1, f"127.0.0.1:{sshd.port}", "bench", "bench")
+            if not use_sftp:
+                ssh_bot.sftp_clients[1] = None
+            cd_time = await timed(ssh_bot, "cd /home/bench/dir{index:03d}")
+            print(f"  {label:12} cd: {cd_time * 1000:.2f} ms")
+            if use_sftp:
+                started = time.monotonic()
+                await ssh_bot.list_dir(1, "/home/bench", refresh=True)
+                cold = time.monotonic() - started
+                started = time.monotonic()
+                await ssh_bot.list_dir(1, "/home/bench")
+                warm = time.monotonic() - started
+                print(f"  listing 200 entries: cold {cold * 1000:.2f} ms, warm {warm * 1000:.3f} ms")
+            await ssh_bot.disconnect_ssh(1)
+        sshd.stop()
+
+async def bench_profiles(args, sshd):
+    """Compare SSH transport profiles on bulk command output.
+
+    Runs against the fake sshd by default, or a real (local) sshd with --ssh.
+    """
+    target = args.ssh or f"127.0.0.1:{sshd.port}"
+    command = args.profile_command or f"emit {args.lines * 10} 1000000 {args.width}"
+
+    async def callback(cmd, output):
+        pass
+
+    print(f"== profiles: '{command}' on {target} ==")
+    for profile in sttbot.SSH_PROFILES:
+        ssh_bot = sttbot.SSHTunnelBot()
+        started = time.monotonic()
+        result = await ssh_bot.connect_ssh(1, target, args.ssh_user, args.ssh_password, profile)
+        connect_time = time.monotonic() - started
+        if result.startswith("❌"):
+            print(f"  {profile:16} {result}")
+            continue
+
+        info = ssh_bot.transport_info(1)
+        timings = []
+        for _ in range(args.repeat):
+            started = time.monotonic()
+            _, output = await ssh_bot.execute_command_realtime(1, command, callback)
+            timings.append(time.monotonic() - started)
+        best = min(timings)
+
+        print(f"  {profile:16} connect {connect_time * 1000:6.0f} ms, "
+              f"{len(output) / 1024:.0f} KiB in {best:.2f} s ({len(output) / best / 1024:.0f} KiB/s) "
+              f"[{info['cipher']}, {info['compression']}]")
+        await ssh_bot.disconnect_ssh(1)
+
+def _serve_sshd(port_queue):
+    server = FakeSSHServer().start()
+    port_queue.put(server.port)
+    while True:
+        time.sleep(1)
+
+async def bench_memory(args, api):
+    """Client-side memory per concurrent session.
+
+    The SSH server runs in a child process so tracemalloc only sees the
+    bot's own allocations.
+    """
+    port_queue = multiprocessing.Queue()
+    server_process = multiprocessing.Process(target=_serve_sshd, args=(port_queue,), daemon=True)
+    server_process.start()
+    port = port_queue.get(timeout=30)
+
+    application = sttbot.build_application(BENCH_TOKEN, api.base_url)
+    await application.initialize()
+    ssh_bot = sttbot.SSHTunnelBot()
+    api.reset()
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    user_ids = list(range(1, args.sessions + 1))
+    for user_id in user_ids:
+        await ssh_bot.connect_ssh(user_id, f"127.0.0.1:{port}", "bench", "bench")
+    connected, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+
+    async def run_session(user_id):
+        message = await application.bot.send_message(user_id, "⚡ Executing...")
+
+        async def callback(cmd, output):
+            try:
+                await message.edit_text(output[-4000:])
+            except Exception:
+                pass
+
+        await ssh_bot.execute_command_realtime(
+            user_id, f"emit {args.lines} {args.rate} {args.width}", callback)
+
+    started = time.monotonic()
+    await asyncio.gather(*(run_session(user_id) for user_id in user_ids))
+    elapsed = time.monotonic() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"== memory: {args.sessions} concurrent sessions ==")
+    print(f"  idle session: {(connected - baseline) / args.sessions / 1024:.1f} KiB")
+    print(f"  peak running: {(peak - baseline) / args.sessions / 1024:.1f} KiB per session")
+    print(f"  wall time:    {elapsed:.2f} s, edits: {len(api.calls_of('editMessageText'))}, "
+          f"429s: {api.throttled}")
+
+    for user_id in user_ids:
+        await ssh_bot.disconnect_ssh(user_id)
+    await application.shutdown()
+    server_process.terminate()
+
+async def run(args):
+    api = await FakeBotAPI(rate_limit=args.rate_limit, fail_every=args.fail_every).start()
+    sshd = FakeSSHServer().start()
+    try:
+        if args.bench in ("all", "e2e"):
+            await bench_e2e(args, api, sshd)
+        if args.bench in ("all", "throughput"):
+            await bench_throughput(args, api, sshd)
+        if args.bench in ("all", "memory"):
+            await bench_memory(args, api)
+        if args.bench in ("all", "jobs"):
+            await bench_jobs(args, sshd)
+        if args.bench in ("all", "dircache"):
+            await bench_dircache(args)
+        if args.bench in ("all", "profiles"):
+            await bench_profiles(args, sshd)
+    finally:
+        sshd.stop()
+        await api.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="STTBot load benchmarks against local fakes")
+    parser.add_argument("--bench", choices=["all", "e2e", "throughput", "memory", "jobs", "dircache", "profiles"], default="all")
+    parser.add_argument("--lines", type=int, default=1000, help="lines emitted per command")
+    parser.add_argument("--rate", type=float, default=500, help="lines per second")
+    parser.add_argument("--width", type=int, default=80, help="characters per line")
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent sessions for memory bench")
+    parser.add_argument("--jobs", type=int, default=30, help="background jobs for the jobs bench")
+    parser.add_argument("--rate-limit", type=int, default=None, help="fake API edits per chat per second")
+    parser.add_argument("--fail-every", type=int, default=None, help="inject a 429 every N calls")
+    parser.add_argument("--ssh", default=None, help="host:port of a real sshd for the profiles bench")
+    parser.add_argument("--ssh-user", default="bench")
+    parser.add_argument("--ssh-password", default="bench")
+    parser.add_argument("--profile-command", default=None, help="command run by the profiles bench")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per profile (best is reported)")
+    parser.add_argument("--verbose", action="store_true", help="keep bot/httpx logging")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        logging.getLogger("bot").setLevel(logging.CRITICAL)
+
+    asyncio.run(run(args))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""Local stand-in for the Telegram Bot API used by the load-test harness"""
+import asyncio
+import json
+import time
+from urllib.parse import parse_qsl
+
+class FakeBotAPI:
+    """Minimal HTTP server answering the Bot API methods STTBot uses.
+
+    Every sendMessage/editMessageText call is recorded together with the
+    time it arrived. 429 responses can be injected either every N-th call
+    (fail_every) or when a chat exceeds a per-second call budget
+    (rate_limit), like Telegram's flood control.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, rate_limit=None, fail_every=None, retry_after=1):
+        self.host = host
+        self.port = port
+        self.rate_limit = rate_limit  # max calls per chat per second, None = unlimited
+        self.fail_every = fail_every  # inject a 429 on every N-th call, None = never
+        self.retry_after = retry_after
+        self.calls = []  # (time, method, params)
+        self.throttled = 0
+        self.message_texts = {}  # (chat_id, message_id) -> latest text
+        self.on_call = None  # optional callback(time, method, params)
+        self._server = None
+        self._next_message_id = 1
+        self._call_count = 0
+        self._recent = {}  # chat_id -> [call times within the last second]
+
+    @property
+    def base_url(self):
+        """Value for the bot's base_url setting"""
+        return f"http://{self.host}:{self.port}/bot"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def reset(self):
+        self.calls.clear()
+        self.message_texts.clear()
+        self.throttled = 0
+        self._call_count = 0
+        self._recent.clear()
+
+    def calls_of(self, method):
+        return [call for call in self.calls if call[1] == method]
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                _, path, _ = request_line.decode().split(" ", 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, value = line.decode().split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+
+                body = b""
+                if "content-length" in headers:
+                    body = await reader.readexactly(int(headers["content-length"]))
+
+                method = path.rsplit("/", 1)[-1]
+                params = self._parse_params(headers.get("content-type", ""), body)
+                status, payload = self._dispatch(method, params)
+
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: keep-alive\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _parse_params(content_type, body):
+        if not body:
+            return {}
+        if content_type.startswith("application/json"):
+            return json.loads(body)
+
+        # PTB sends form-encoded fields with JSON-encoded values
+        params = {}
+        for key, value in parse_qsl(body.decode(), keep_blank_values=True):
+            try:
+                params[key] = json.loads(value)
+            except ValueError:
+                params[key] = value
+        return params
+
+    def _throttle(self, chat_id, now):
+        self._call_count += 1
+        if self.fail_every and self._call_count % self.fail_every == 0:
+            return True
+
+        if self.rate_limit:
+            recent = [t for t in self._recent.get(chat_id, []) if now - t < 1.0]
+            if len(recent) >= self.rate_limit:
+                self._recent[chat_id] = recent
+                return True
+            recent.append(now)
+            self._recent[chat_id] = recent
+        return False
+
+    def _message(self, chat_id, message_id, text):
+        return {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": 1, "is_bot": True, "first_name": "FakeBot", "username": "fake_bot"},
+            "text": text
+        }
+
+    def _dispatch(self, method, params):
+        now = time.monotonic()
+
+        if method == "getMe":
+            return 200, {"ok": True, "result": {
+                "id": 1, "is_bot": True, "first_name": "FakeBot", "username": "fake_bot",
+                "can_join_groups": False, "can_read_all_group_messages": False,
+                "supports_inline_queries": False
+            }}
+
+        if method not in ("sendMessage", "editMessageText"):
+            return 200, {"ok": True, "result": True}
+
+        chat_id = int(params.get("chat_id", 0))
+        if self._throttle(chat_id, now):
+            self.throttled += 1
+            return 429, {
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {self.retry_after}",
+                "parameters": {"retry_after": self.retry_after}
+            }
+
+        self.calls.append((now, method, params))
+        if self.on_call:
+            self.on_call(now, method, params)
+
+        text = params.get("text", "")
+        if method == "sendMessage":
+            message_id = self._next_message_id
+            self._next_message_id += 1
+        else:
+            message_id = int(params.get("message_id", 0))
+        self.message_texts[(chat_id, message_id)] = text
+
+        return 200, {"ok": True, "result": self._message(chat_id, message_id, text)}
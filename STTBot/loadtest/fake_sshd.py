@@ -0,0 +1,260 @@
+"""In-process paramiko SSH server emitting scripted output for load tests"""
+import argparse
+import os
+import posixpath
+import re
+import shlex
+import socket
+import threading
+import time
+import paramiko
+
+HOME_DIR = "/home/bench"
+# The bot's working-directory prefix: cd <shlex-quoted dir> &&
+CD_PREFIX_RE = re.compile(r"""^cd (?:'[^']*'(?:"'"'[^']*')*|[^\s']+) && """)
+
+class ScriptedServer(paramiko.ServerInterface):
+    """Accepts any password and runs each exec request as a script"""
+
+    def __init__(self, sshd):
+        self.sshd = sshd
+
+    def check_auth_password(self, username, password):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_pty_request(self, channel, term, width, height, pixelwidth, pixelheight, modes):
+        return True
+
+    def check_channel_exec_request(self, channel, command):
+        thread = threading.Thread(
+            target=self.sshd.run_script,
+            args=(channel, command.decode()),
+            daemon=True
+        )
+        thread.start()
+        return True
+
+class ReadOnlySFTP(paramiko.SFTPServerInterface):
+    """SFTP subsystem exposing a local directory tree (read-only) as the remote "/" """
+
+    def __init__(self, server, root):
+        super().__init__(server)
+        self.root = root
+
+    def _local(self, path):
+        path = os.path.normpath("/" + path.lstrip("/"))
+        return os.path.join(self.root, path.lstrip("/"))
+
+    def list_folder(self, path):
+        try:
+            local = self._local(path)
+            return [
+                paramiko.SFTPAttributes.from_stat(os.lstat(os.path.join(local, name)), name)
+                for name in os.listdir(local)
+            ]
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def stat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(self._local(path)))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def lstat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.lstat(self._local(path)))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def canonicalize(self, path):
+        return os.path.normpath("/" + path.lstrip("/"))
+
+class FakeSSHServer:
+    """Local SSH server for benchmarking STTBot without a real host.
+
+    Commands understood (after the bot's "cd <dir> && " prefix):
+      pwd                          - print the working directory
+      pwd; id -u; id -G            - ... plus the local uid and groups
+      cd <path> ... && pwd         - print <path> (the bot's cd probe); with
+                                     sftp_root, fail if it isn't a directory there
+      emit <lines> <rate> [width]  - print <lines> lines at <rate> lines/s;
+                                     each line carries a sequence number and
+                                     a time.monotonic() stamp for latency
+      anything else                - echoed back once
+
+    With sftp_root set, an SFTP subsystem serves that local directory
+    (read-only) as the remote filesystem.
+    """
+
+    _host_key = None
+
+    def __init__(self, host="127.0.0.1", port=0, sftp_root=None):
+        self.host = host
+        self.port = port
+        self.sftp_root = sftp_root
+        self.connections = 0
+        self.bytes_sent = 0
+        self._sock = None
+        self._transports = []
+        self._running = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def host_key(cls):
+        if cls._host_key is None:
+            cls._host_key = paramiko.RSAKey.generate(2048)
+        return cls._host_key
+
+    def start(self):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((self.host, self.port))
+        self._sock.listen(100)
+        self._sock.settimeout(0.2)
+        self.port = self._sock.getsockname()[1]
+        self._running = True
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._running = False
+        for transport in self._transports:
+            transport.close()
+        self._transports.clear()
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+
+    def serve_forever(self):
+        self.start()
+        try:
+            while self._running:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                client, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            transport = paramiko.Transport(client)
+            transport.add_server_key(self.host_key())
+            # Like OpenSSH, allow (but don't force) compression
+            transport.use_compression(True)
+            if self.sftp_root:
+                transport.set_subsystem_handler("sftp", paramiko.SFTPServer, ReadOnlySFTP, self.sftp_root)
+            try:
+                transport.start_server(server=ScriptedServer(self))
+            except paramiko.SSHException:
+                continue
+            self._transports.append(transport)
+            self.connections += 1
+            threading.Thread(target=self._drain_channels, args=(transport,), daemon=True).start()
+
+    @staticmethod
+    def _drain_channels(transport):
+        # Channels are served from check_channel_exec_request; accepting
+        # them here keeps a reference so paramiko doesn't close them on GC.
+        channels = []
+        while transport.is_active():
+            channel = transport.accept(timeout=1)
+            channels = [chan for chan in channels if not chan.closed]
+            if channel is not None:
+                channels.append(channel)
+
+    def _send(self, channel, data):
+        channel.sendall(data)
+        with self._lock:
+            self.bytes_sent += len(data)
+
+    def run_script(self, channel, command):
+        status = 0
+        # paramiko sends the exec reply only after check_channel_exec_request
+        # returns; wait a moment so output and close never overtake it.
+        time.sleep(0.01)
+        try:
+            # Strip the bot's working-directory prefix
+            cwd = HOME_DIR
+            match = CD_PREFIX_RE.match(command)
+            if match:
+                cwd = shlex.split(match.group(0)[3:-4])[0]
+                command = command[match.end():]
+
+            if command.strip() == "pwd":
+                self._send(channel, f"{HOME_DIR}\n".encode())
+            elif command.strip() == "pwd; id -u; id -G":
+                groups = " ".join(str(gid) for gid in os.getgroups())
+                self._send(channel, f"{HOME_DIR}\n{os.getuid()}\n{groups}\n".encode())
+            elif command.startswith("cd ") and "&& pwd" in command:
+                path = posixpath.normpath(posixpath.join(cwd, shlex.split(command[3:].split(" 2>", 1)[0])[0]))
+                if self.sftp_root and not os.path.isdir(os.path.join(self.sftp_root, path.lstrip("/"))):
+                    status = 1
+                else:
+                    self._send(channel, f"{path}\n".encode())
+            elif command.startswith("emit "):
+                status = self._emit(channel, shlex.split(command)[1:])
+            else:
+                self._send(channel, f"{command}\r\n".encode())
+        except (OSError, EOFError, paramiko.SSHException):
+            status = 255
+        finally:
+            try:
+                channel.send_exit_status(status)
+                channel.close()
+            except (OSError, EOFError, paramiko.SSHException):
+                pass
+
+    def _emit(self, channel, args):
+        lines = int(args[0]) if args else 100
+        rate = float(args[1]) if len(args) > 1 else 100.0
+        width = int(args[2]) if len(args) > 2 else 80
+
+        # Send in ~10ms batches so high rates don't turn into one syscall per line
+        batch_interval = 0.01
+        started = time.monotonic()
+        seq = 0
+        while seq < lines:
+            # Ctrl+C from /stop
+            if channel.recv_ready() and b"\x03" in channel.recv(1024):
+                return 130
+
+            due = min(lines, int((time.monotonic() - started) * rate) + 1)
+            chunk = []
+            while seq < due:
+                prefix = f"{seq:06d} {time.monotonic():.6f} "
+                chunk.append(prefix + "x" * max(0, width - len(prefix)) + "\r\n")
+                seq += 1
+            if chunk:
+                self._send(channel, "".join(chunk).encode())
+            time.sleep(batch_interval)
+        return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Scripted SSH server for STTBot load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2222)
+    parser.add_argument("--sftp-root", default=None, help="local directory served over SFTP")
+    args = parser.parse_args()
+
+    server = FakeSSHServer(args.host, args.port, args.sftp_root)
+    print(f"Fake sshd listening on {args.host}:{args.port} (any username/password)")
+    server.serve_forever()
+
+if __name__ == '__main__':
+    main()
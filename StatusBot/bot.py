@@ -1,13 +1,53 @@
 import subprocess
 import logging
+import asyncio
+import ctypes
+import ctypes.util
+import hashlib
+import html
+import os
+import re
+import shlex
+from collections import OrderedDict, deque
 from functools import wraps
-from telegram import Update
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest, RetryAfter
+from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes
 
 # Configuration
 BOT_TOKEN = "YOUR_BOT_TOKEN_HERE"
 ALLOWED_USER_ID = 123456789 # YOUR REAL USER ID HERE
 
+# Update delivery: "polling" (default) or "webhook"
+RUN_MODE = "polling"
+# Webhook settings (used when RUN_MODE = "webhook")
+WEBHOOK_LISTEN = "127.0.0.1"  # plain-HTTP listener; put a TLS reverse proxy in front of it
+WEBHOOK_PORT = 8443
+WEBHOOK_PATH = "statusbot"
+WEBHOOK_URL = "https://your.domain.example/statusbot"  # public URL Telegram posts updates to
+WEBHOOK_SECRET_PLACEHOLDER = "CHANGE_ME_random_secret_token"
+WEBHOOK_SECRET = WEBHOOK_SECRET_PLACEHOLDER  # checked against X-Telegram-Bot-Api-Secret-Token; must be changed
+# Bot API endpoint; point it at a local fake Bot API for testing
+BOT_API_BASE_URL = "https://api.telegram.org/bot"
+# Only commands and inline keyboard presses are handled, so don't subscribe to every update type
+ALLOWED_UPDATES = [Update.MESSAGE, Update.CALLBACK_QUERY]
+
+# /status rendering
+STATUS_MESSAGE_LIMIT = 4096  # Telegram's message length limit
+STATUS_OVERFLOW = "paginate"  # "paginate" (pages with buttons) or "truncate" (shorten least important sections)
+STATUS_SECTION_MAX_CHARS = 3000  # "truncate" mode: longer collector output is cut before rendering
+STATUS_RENDER_CACHE_SIZE = 64  # rendered sections kept
+
+# /logs settings
+LOG_ALLOWED_PATHS = ["/var/log"]  # files under these directories may be read
+LOG_ALLOWED_UNITS = None  # systemd units readable via journalctl, None = any unit
+LOG_DEFAULT_LINES = 20
+LOG_MAX_LINES = 200
+LOG_BLOCK_SIZE = 64 * 1024  # bytes read per step when scanning backwards
+LOG_MAX_BYTES = 1024 * 1024  # never scan further back than this from the end of a file
+LOG_FOLLOW_INTERVAL = 2.0  # minimum seconds between message edits in /logs -f
+LOG_FOLLOW_TIMEOUT = 600  # seconds before /logs -f stops by itself
+
 # Enable logging
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -31,6 +71,9 @@ def restricted(func):
     async def wrapped(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
         user_id = update.effective_user.id
         if user_id != ALLOWED_USER_ID:
+            if update.callback_query:
+                await update.callback_query.answer("⛔ Access denied.")
+                return
             await update.message.reply_text(
                 "⛔ Access denied.\n"
                 "To install StatusBot, clone the repository https://github.com/K2254IVV/TBotUtils4Linux"
@@ -54,66 +97,219 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 Available commands:
 /status - System status information
 /uptimeinfo - System uptime information
+/logs [-f] <file|unit> [lines] - Show (or follow) a log
     """
     await update.message.reply_text(welcome_text, parse_mode='Markdown')
 
+def collect_status_sections():
+    """Run the status collectors; returns the header line and the sections.
+    
+    Lower priority numbers are more important and are shortened last.
+    """
+    hostname = run_command("cat /etc/hostname")
+    username = run_command("whoami")
+    product_name = run_command("cat /sys/devices/virtual/dmi/id/product_name")
+    disk_info = run_command("df -h")
+    ram_info = run_command("free -h")
+    ip_info = run_command("ip -4 -o addr show | awk '{split($4, a, \"/\"); print \"📝 \" $2 \": \" a[1]}'")
+    os_info = run_command(". /etc/os-release && echo \"📝 $NAME $VERSION\"")
+    temp_info = run_command("sensors | grep -E 'Adapter|temp1|Composite' | grep -v 'high\\|low\\|crit'")
+    
+    header = f"🏴‍☠️ {hostname}:{username} {product_name} 🏴‍☠️ Status:"
+    sections = [
+        {'title': "✅ Free Disk Space ✅", 'lang': "fdsinfo", 'body': disk_info, 'priority': 2},
+        {'title': "🤠 RAM Info 🤠", 'lang': "rinfo", 'body': ram_info, 'priority': 1},
+        {'title': "🌐 IPv4 addresses", 'lang': "IPlist", 'body': ip_info, 'priority': 3},
+        {'title': "🔥 Temperature Information", 'lang': "tempinfo", 'body': temp_info, 'priority': 4},
+        {'title': "Summary", 'lang': "summary", 'body': f"{os_info}\n{product_name}", 'priority': 0}
+    ]
+    return header, sections
+
+def message_length(text):
+    """Length as Telegram counts it (UTF-16 code units)"""
+    return len(text.encode('utf-16-le')) // 2
+
+def truncate_body(body, max_length):
+    """Keep the first lines of body that fit in max_length, noting how many were cut"""
+    if message_length(body) <= max_length:
+        return body
+    
+    lines = body.splitlines()
+    kept = []
+    budget = max_length - 30  # room for the "more lines" note
+    for line in lines:
+        length = message_length(line) + 1
+        if length > budget:
+            break
+        kept.append(line)
+        budget -= length
+    
+    if not kept and lines:
+        # A single huge line: cut it by UTF-16 units, dropping a split surrogate pair
+        rest = len(lines) - 1
+        note = "… (line truncated)" + (f", {rest} more lines" if rest else "")
+        room = max(0, max_length - message_length(note) - 1)
+        line = lines[0].encode('utf-16-le')[:room * 2].decode('utf-16-le', errors='ignore')
+        return f"{line}\n{note}"
+    
+    return "\n".join(kept + [f"… {len(lines) - len(kept)} more lines"])
+
+# Rendered sections keyed by content hash
+section_cache = OrderedDict()
+
+def render_section(section, max_length=None):
+    """Render a section as a Markdown code block, optionally shortened to max_length"""
+    # Backticks in collector output would end the code block
+    body = section['body'].replace("`", "'")
+    
+    key = hashlib.sha1(f"{section['title']}\0{section['lang']}\0{max_length}\0{body}".encode()).hexdigest()
+    rendered = section_cache.get(key)
+    if rendered is not None:
+        section_cache.move_to_end(key)
+        return rendered
+    
+    if max_length is not None:
+        body = truncate_body(body, max_length)
+    rendered = f"{section['title']}:\n```{section['lang']}\n{body}\n```"
+    
+    section_cache[key] = rendered
+    while len(section_cache) > STATUS_RENDER_CACHE_SIZE:
+        section_cache.popitem(last=False)
+    return rendered
+
+def section_overhead(section):
+    """Characters a rendered section adds around its body"""
+    return message_length(render_section({**section, 'body': ""}))
+
+def split_section(section, max_length):
+    """Split a section at line breaks into parts whose bodies fit max_length; later parts are titled "(cont.)" """
+    parts = []
+    lines = []
+    length = 0
+    for line in section['body'].splitlines():
+        line_length = message_length(line) + 1
+        if lines and length + line_length > max_length:
+            parts.append(lines)
+            lines, length = [], 0
+        lines.append(line)
+        length += line_length
+    parts.append(lines)
+    
+    return [
+        {**section, 'title': section['title'] if i == 0 else f"{section['title']} (cont.)", 'body': "\n".join(part)}
+        for i, part in enumerate(parts)
+    ]
+
+def fit_status_truncated(header, sections, limit=STATUS_MESSAGE_LIMIT):
+    """One message; the least important sections are shortened (or omitted) until it fits"""
+    rendered = [
+        render_section(section, STATUS_SECTION_MAX_CHARS if message_length(section['body']) > STATUS_SECTION_MAX_CHARS else None)
+        for section in sections
+    ]
+    
+    for index in sorted(range(len(sections)), key=lambda i: sections[i]['priority'], reverse=True):
+        excess = message_length("\n\n".join([header] + rendered)) - limit
+        if excess <= 0:
+            break
+        
+        section = sections[index]
+        budget = message_length(rendered[index]) - section_overhead(section) - excess
+        if budget < 40:
+            rendered[index] = f"{section['title']}: (omitted, message too long)"
+        else:
+            rendered[index] = render_section(section, min(budget, STATUS_SECTION_MAX_CHARS))
+    
+    return "\n\n".join([header] + rendered)
+
+def paginate_status(header, sections, limit=STATUS_MESSAGE_LIMIT):
+    """Split the sections into pages that each fit in one message (header on every page)"""
+    pages = []
+    current = header
+    page_room = limit - message_length(header) - 2
+    for section in sections:
+        parts = [render_section(section)]
+        
+        # Too big for a page of its own: continue it over several pages
+        if message_length(parts[0]) > page_room:
+            room = page_room - section_overhead({**section, 'title': f"{section['title']} (cont.)"})
+            parts = [render_section(part, room) for part in split_section(section, room)]
+        
+        for rendered in parts:
+            if message_length(current) + 2 + message_length(rendered) > limit:
+                pages.append(current)
+                current = header
+            current += "\n\n" + rendered
+    
+    pages.append(current)
+    return pages
+
+# Pages of the last paginated /status per chat, chat_id -> (snapshot id, pages)
+status_pages = {}
+
+def status_page_keyboard(chat_id, page):
+    """Previous/next buttons for a page of the chat's last /status, None if it has one page"""
+    snapshot, pages = status_pages[chat_id]
+    if len(pages) < 2:
+        return None
+    
+    buttons = []
+    if page > 0:
+        buttons.append(InlineKeyboardButton("◀️", callback_data=f"status:{snapshot}:{page - 1}"))
+    buttons.append(InlineKeyboardButton(f"{page + 1}/{len(pages)}", callback_data=f"status:{snapshot}:{page}"))
+    if page < len(pages) - 1:
+        buttons.append(InlineKeyboardButton("▶️", callback_data=f"status:{snapshot}:{page + 1}"))
+    return InlineKeyboardMarkup([buttons])
+
 @restricted
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /status command"""
     try:
         # Collect system information
-        hostname = run_command("cat /etc/hostname")
-        username = run_command("whoami")
-        product_name = run_command("cat /sys/devices/virtual/dmi/id/product_name")
-        disk_info = run_command("df -h")
-        ram_info = run_command("free -h")
-        ip_info = run_command("ip -4 -o addr show | awk '{split($4, a, \"/\"); print \"📝 \" $2 \": \" a[1]}'")
-        os_info = run_command(". /etc/os-release && echo \"📝 $NAME $VERSION\"")
-        temp_info = run_command("sensors | grep -E 'Adapter|temp1|Composite' | grep -v 'high\\|low\\|crit'")
-        
-        # Format message with Markdown
-        message = f"""🏴‍☠️ {hostname}:{username} {product_name} 🏴‍☠️ Status:
-
-✅ Free Disk Space ✅:
-```fdsinfo
-{disk_info}
-```
-
-🤠 RAM Info 🤠:
-```rinfo
-{ram_info}
-```
-
-🌐 IPv4 addresses:
-```IPlist
-{ip_info}
-```
-
-🔥 Temperature Information:
-```tempinfo
-{temp_info}
-```
-
-Summary:
-```summary
-{os_info}
-{product_name}
-
-{disk_info}
-
-{ram_info}
-
-{ip_info}
-
-{temp_info}
-```"""
+        header, sections = collect_status_sections()
         
-        await update.message.reply_text(message, parse_mode='Markdown')
+        if STATUS_OVERFLOW == "truncate":
+            message = fit_status_truncated(header, sections)
+            await update.message.reply_text(message, parse_mode='Markdown')
+            return
+        
+        chat_id = update.effective_chat.id
+        snapshot = status_pages.get(chat_id, (0, []))[0] + 1
+        status_pages[chat_id] = (snapshot, paginate_status(header, sections))
+        
+        await update.message.reply_text(
+            status_pages[chat_id][1][0],
+            parse_mode='Markdown',
+            reply_markup=status_page_keyboard(chat_id, 0)
+        )
         
     except Exception as e:
         logger.error(f"Error in status command: {e}")
         await update.message.reply_text("❌ Error fetching system status.")
 
+@restricted
+async def status_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /status page buttons"""
+    query = update.callback_query
+    chat_id = update.effective_chat.id
+    
+    try:
+        _, snapshot, page = query.data.split(":")
+        current, pages = status_pages[chat_id]
+        snapshot, page = int(snapshot), int(page)
+        if snapshot != current or not 0 <= page < len(pages):
+            raise ValueError
+    except (KeyError, ValueError):
+        await query.answer("⌛ This status is outdated, use /status again.")
+        return
+    
+    await query.answer()
+    try:
+        await query.edit_message_text(pages[page], parse_mode='Markdown', reply_markup=status_page_keyboard(chat_id, page))
+    except BadRequest as e:
+        # Pressing the current page's button
+        if "not modified" not in str(e):
+            raise
+
 @restricted
 async def uptimeinfo_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /uptimeinfo command"""
@@ -141,20 +337,356 @@ async def uptimeinfo_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         logger.error(f"Error in uptimeinfo command: {e}")
         await update.message.reply_text("❌ Error fetching uptime information.")
 
+def tail_lines(path, count):
+    """Return the last count lines of a file, reading blocks backwards from the end.
+    
+    At most LOG_MAX_BYTES are read; a line cut at that boundary starts with "…".
+    Raises ValueError for binary files (e.g. wtmp, lastlog).
+    """
+    if count < 1:
+        return []
+    
+    with open(path, 'rb') as f:
+        end = pos = f.seek(0, os.SEEK_END)
+        chunks = []
+        newlines = 0
+        
+        # A trailing newline ends the last line, so we need count + 1 newlines
+        while pos > 0 and newlines <= count and end - pos < LOG_MAX_BYTES:
+            size = min(LOG_BLOCK_SIZE, pos, LOG_MAX_BYTES - (end - pos))
+            pos -= size
+            f.seek(pos)
+            chunk = f.read(size)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+    
+    data = b"".join(reversed(chunks))
+    if b"\0" in data:
+        raise ValueError(f"{path} looks like a binary file")
+    
+    lines = data.splitlines()
+    if pos > 0 and len(lines) <= count and lines:
+        # Scan stopped mid-line: the first line is only the end of a longer one
+        lines[0] = "…".encode() + lines[0]
+    return [line.decode('utf-8', errors='replace') for line in lines[-count:]]
+
+def resolve_log_target(target):
+    """Map a /logs argument to ('file', path) or ('unit', name); returns (None, error) if not allowed"""
+    allowed_roots = [os.path.realpath(root) for root in LOG_ALLOWED_PATHS]
+    
+    # Bare file names are looked up in the allowed directories
+    if "/" not in target:
+        for root in allowed_roots:
+            candidate = os.path.join(root, target)
+            if os.path.isfile(candidate):
+                target = candidate
+                break
+    
+    if "/" in target:
+        path = os.path.realpath(target)
+        if not any(path == root or path.startswith(root.rstrip("/") + "/") for root in allowed_roots):
+            return None, f"❌ {target} is outside the allowed log paths: {', '.join(LOG_ALLOWED_PATHS)}"
+        if not os.path.isfile(path):
+            return None, f"❌ {target} is not a file"
+        return "file", path
+    
+    if not re.fullmatch(r"[\w@.:-]+", target):
+        return None, f"❌ Invalid unit name: {target}"
+    if LOG_ALLOWED_UNITS is not None and target not in LOG_ALLOWED_UNITS:
+        return None, f"❌ Unit {target} is not in the allowed units"
+    return "unit", target
+
+def format_log(title, lines):
+    """Format log lines as an HTML message, keeping the newest lines within Telegram's limit"""
+    header = f"📜 <b>{html.escape(title)}</b>\n"
+    budget = 4096 - len(header) - len("<pre></pre>")
+    
+    kept = []
+    for line in reversed(lines):
+        escaped = html.escape(line)
+        if len(escaped) + 1 > budget:
+            # Cut the line that doesn't fit rather than dropping it
+            cut = []
+            used = 2  # newline and "…"
+            for char in line:
+                escaped_char = html.escape(char)
+                if used + len(escaped_char) > budget:
+                    break
+                cut.append(escaped_char)
+                used += len(escaped_char)
+            if cut:
+                kept.append("".join(cut) + "…")
+            break
+        kept.append(escaped)
+        budget -= len(escaped) + 1
+    
+    body = "\n".join(reversed(kept)) or "(no lines)"
+    return f"{header}<pre>{body}</pre>"
+
+class Inotify:
+    """Minimal inotify binding via ctypes, used to wake /logs -f on file changes"""
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_MOVE_SELF = 0x00000800
+    IN_DELETE_SELF = 0x00000400
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.wd = None
+    
+    def watch(self, path):
+        """Watch a file (replacing the previous watch)"""
+        if self.wd is not None:
+            self._libc.inotify_rm_watch(self.fd, self.wd)
+        mask = self.IN_MODIFY | self.IN_ATTRIB | self.IN_MOVE_SELF | self.IN_DELETE_SELF
+        self.wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if self.wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+    
+    def drain(self):
+        """Discard pending events; we only need the wakeup"""
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+    
+    def close(self):
+        os.close(self.fd)
+
+class FileFollower:
+    """Yields lines appended to a log file, woken by inotify (or a timer if unavailable)"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.file.seek(0, os.SEEK_END)
+        self.partial = b""
+        self.changed = asyncio.Event()
+        self.inotify = None
+        try:
+            self.inotify = Inotify()
+            self.inotify.watch(path)
+            asyncio.get_running_loop().add_reader(self.inotify.fd, self._on_event)
+        except (OSError, AttributeError):
+            logger.warning("inotify not available, /logs -f falls back to periodic reads")
+            if self.inotify is not None:
+                # init worked but the watch didn't (permissions, watch limit)
+                self.inotify.close()
+            self.inotify = None
+    
+    def _on_event(self):
+        # Drain right away: the event loop polls level-triggered
+        self.inotify.drain()
+        self.changed.set()
+    
+    async def read(self, timeout):
+        """Wait up to timeout for new data and return the complete lines appended"""
+        try:
+            await asyncio.wait_for(self.changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self.changed.clear()
+        
+        data = self.file.read()
+        
+        # Truncated in place (copytruncate): start over
+        if os.fstat(self.file.fileno()).st_size < self.file.tell():
+            self.file.seek(0)
+            data += self.file.read()
+        
+        # Rotated (renamed or deleted): switch to the new file
+        try:
+            if os.stat(self.path).st_ino != os.fstat(self.file.fileno()).st_ino:
+                self.file.close()
+                self.file = open(self.path, 'rb')
+                data += self.file.read()
+                if self.inotify:
+                    self.inotify.watch(self.path)
+        except FileNotFoundError:
+            pass
+        
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+        return [line.decode('utf-8', errors='replace') for line in lines]
+    
+    async def close(self):
+        if self.inotify:
+            asyncio.get_running_loop().remove_reader(self.inotify.fd)
+            self.inotify.close()
+        self.file.close()
+
+class JournalFollower:
+    """Yields new journal lines of a systemd unit from journalctl -f"""
+    
+    def __init__(self, unit):
+        self.unit = unit
+        self.process = None
+        self.queue = asyncio.Queue()
+        self.reader = None
+    
+    async def start(self):
+        self.process = await asyncio.create_subprocess_exec(
+            "journalctl", "-u", self.unit, "-f", "-n", "0", "--no-pager", "-o", "short",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        self.reader = asyncio.create_task(self._pump())
+        return self
+    
+    async def _pump(self):
+        async for line in self.process.stdout:
+            await self.queue.put(line.decode('utf-8', errors='replace').rstrip("\n"))
+    
+    async def read(self, timeout):
+        lines = []
+        try:
+            lines.append(await asyncio.wait_for(self.queue.get(), timeout))
+        except asyncio.TimeoutError:
+            return lines
+        while not self.queue.empty():
+            lines.append(self.queue.get_nowait())
+        return lines
+    
+    async def close(self):
+        if self.reader:
+            self.reader.cancel()
+        if self.process and self.process.returncode is None:
+            self.process.kill()
+            # Reap journalctl so it doesn't linger as a zombie
+            await self.process.wait()
+
+# Running /logs -f tasks, chat_id -> asyncio.Task
+log_follows = {}
+
+async def follow_log(message, title, lines, follower):
+    """Append new lines to a message, batching them into rate-limited edits"""
+    loop = asyncio.get_running_loop()
+    lines = deque(lines, maxlen=LOG_MAX_LINES)
+    deadline = loop.time() + LOG_FOLLOW_TIMEOUT
+    next_edit = loop.time() + LOG_FOLLOW_INTERVAL
+    pending = False
+    
+    try:
+        while loop.time() < deadline:
+            new_lines = await follower.read(max(0.0, next_edit - loop.time()) if pending else LOG_FOLLOW_INTERVAL)
+            if new_lines:
+                lines.extend(new_lines)
+                pending = True
+            
+            if pending and loop.time() >= next_edit:
+                try:
+                    await message.edit_text(format_log(f"{title} (following)", lines), parse_mode='HTML')
+                    pending = False
+                    next_edit = loop.time() + LOG_FOLLOW_INTERVAL
+                except RetryAfter as e:
+                    next_edit = loop.time() + e.retry_after
+                except Exception as e:
+                    logger.error(f"Error updating log message: {e}")
+                    next_edit = loop.time() + LOG_FOLLOW_INTERVAL
+        
+        await message.edit_text(format_log(f"{title} (stopped after {LOG_FOLLOW_TIMEOUT}s)", lines), parse_mode='HTML')
+    except asyncio.CancelledError:
+        await message.edit_text(format_log(f"{title} (stopped)", lines), parse_mode='HTML')
+        raise
+    finally:
+        await follower.close()
+
+@restricted
+async def logs_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /logs command"""
+    chat_id = update.effective_chat.id
+    args = list(context.args)
+    
+    if args == ["stop"]:
+        task = log_follows.pop(chat_id, None)
+        if task and not task.done():
+            task.cancel()
+            await update.message.reply_text("⏹️ Stopped following log.")
+        else:
+            await update.message.reply_text("❌ No log is being followed.")
+        return
+    
+    follow = "-f" in args
+    if follow:
+        args.remove("-f")
+    
+    if not args or len(args) > 2 or (len(args) == 2 and not (args[1].isdigit() and int(args[1]) > 0)):
+        await update.message.reply_text(
+            "❌ Usage: /logs [-f] <file|unit> [lines]\n"
+            "Example: /logs syslog 50\n"
+            "Example: /logs -f /var/log/nginx/access.log\n"
+            "Example: /logs ssh\n"
+            "/logs stop - stop following"
+        )
+        return
+    
+    count = min(int(args[1]) if len(args) == 2 else LOG_DEFAULT_LINES, LOG_MAX_LINES)
+    kind, target = resolve_log_target(args[0])
+    if kind is None:
+        await update.message.reply_text(target)
+        return
+    
+    try:
+        if kind == "file":
+            lines = await asyncio.to_thread(tail_lines, target, count)
+        else:
+            output = run_command(f"journalctl -u {shlex.quote(target)} -n {count} --no-pager -o short")
+            lines = output.splitlines()
+        
+        message = await update.message.reply_text(format_log(target, lines), parse_mode='HTML')
+        
+        if follow:
+            follower = FileFollower(target) if kind == "file" else await JournalFollower(target).start()
+            
+            # Only one follow per chat
+            previous = log_follows.pop(chat_id, None)
+            if previous and not previous.done():
+                previous.cancel()
+            log_follows[chat_id] = context.application.create_task(follow_log(message, target, lines, follower))
+        
+    except Exception as e:
+        logger.error(f"Error in logs command: {e}")
+        await update.message.reply_text(f"❌ Error reading log: {str(e)}")
+
 def main():
     """Start the bot"""
     # Create application
-    application = Application.builder().token(BOT_TOKEN).build()
+    application = Application.builder().token(BOT_TOKEN).base_url(BOT_API_BASE_URL).build()
     
     # Add command handlers
     application.add_handler(CommandHandler("start", start_command))
     application.add_handler(CommandHandler("status", status_command))
+    application.add_handler(CallbackQueryHandler(status_page_callback, pattern=r"^status:"))
     application.add_handler(CommandHandler("uptimeinfo", uptimeinfo_command))
+    application.add_handler(CommandHandler("logs", logs_command))
     
     # Start bot
     print("🤖 pyStatusBot is running...")
     print(f"👤 Allowed User ID: {ALLOWED_USER_ID}")
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    if RUN_MODE == "webhook":
+        # The secret is all that stops forged updates from reaching the handlers
+        if not WEBHOOK_SECRET or WEBHOOK_SECRET == WEBHOOK_SECRET_PLACEHOLDER:
+            raise SystemExit(
+                "❌ Set WEBHOOK_SECRET to your own random value before using webhook mode, e.g.\n"
+                '   python -c "import secrets; print(secrets.token_urlsafe(32))"'
+            )
+        print(f"🌐 Webhook mode: listening on {WEBHOOK_LISTEN}:{WEBHOOK_PORT}/{WEBHOOK_PATH}")
+        application.run_webhook(
+            listen=WEBHOOK_LISTEN,
+            port=WEBHOOK_PORT,
+            url_path=WEBHOOK_PATH,
+            webhook_url=WEBHOOK_URL,
+            secret_token=WEBHOOK_SECRET,
+            allowed_updates=ALLOWED_UPDATES
+        )
+    else:
+        application.run_polling(allowed_updates=ALLOWED_UPDATES)
 
 if __name__ == '__main__':
     main()